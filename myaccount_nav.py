@@ -2,6 +2,8 @@ import pandas as pd
 import numpy as np
 import traceback
 import os
+from datetime import datetime
+from typing import Optional, Union
 from tqdm import tqdm
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -10,11 +12,139 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import InvalidArgumentException, NoSuchElementException, TimeoutException
 from selenium.webdriver.firefox.options import Options
 
+class CategoricalColumn():
+    """
+    Column of values from a small set, stored as integer codes into a category table
+    - :param: length: Length of the input list of users
+    - :param: categories: (Optional) Expected values, seeded into the category table in this order
+
+    Values not in the table are appended to it on assignment, and unset entries are coded -1.
+    """
+    __code_dtypes = (np.int8, np.int16, np.int32, np.int64)
+
+    def __init__(self, length: int, categories: tuple = ()):
+        self.categories = list(categories)
+        self.__codes_by_value = {value: code for (code, value) in enumerate(self.categories)}
+        self.codes = np.full(length, -1, dtype=np.int8)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index: int):
+        code = self.codes[index]
+        return None if code < 0 else self.categories[code]
+
+    def __setitem__(self, index: int, value) -> None:
+        self.codes[index] = self.__encode(value)
+
+    def __encode(self, value) -> int:
+        """ Returns the code for value, adding it to the category table if unseen"""
+        if value is None:
+            return -1
+
+        code = self.__codes_by_value.get(value)
+        if code is None:
+            code = len(self.categories)
+            self.categories.append(value)
+            self.__codes_by_value[value] = code
+
+            if code > np.iinfo(self.codes.dtype).max:
+                wider = self.__code_dtypes[self.__code_dtypes.index(self.codes.dtype.type) + 1]
+                self.codes = self.codes.astype(wider)
+        return code
+
+    def equals(self, value, index: Optional[int] = None) -> Union[bool, np.ndarray]:
+        """ Whether the index-th entry equals value, or a boolean mask over the whole column if no index is given"""
+        code = self.__codes_by_value.get(value)
+        if index is not None:
+            return code is not None and self.codes[index] == code
+        if code is None:
+            return np.zeros(len(self.codes), dtype=bool)
+        return self.codes == code
+
+    def to_categorical(self) -> pd.Categorical:
+        """ Wraps the codes and category table into a pandas Categorical"""
+        return pd.Categorical.from_codes(self.codes, categories=self.categories)
+
+class DateColumn():
+    """
+    Column of dates parsed from MyAccount text into a datetime64[D] array
+    - :param: length: Length of the input list of users
+    - :param: (Optional) Format of the date text, MM/DD/YYYY by default
+
+    Unset entries are NaT. Text that does not round-trip exactly through date_format (empty, differently
+    formatted, surrounding whitespace, out of range) is kept as-is in a sparse raw dictionary so it is never lost.
+    Indexing returns the date formatted back into text, the raw text, or None if unset.
+    """
+    # Range a pandas datetime64[ns] column can hold
+    __min_exportable = np.datetime64("1677-09-22")
+    __max_exportable = np.datetime64("2262-04-11")
+
+    def __init__(self, length: int, date_format: str = "%m/%d/%Y"):
+        self.date_format = date_format
+        self.values = np.full(length, np.datetime64("NaT"), dtype="datetime64[D]")
+        self.raw = {}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, index: int):
+        value = self.values[index]
+        if np.isnat(value):
+            return self.raw.get(int(index))
+        return value.astype(datetime).strftime(self.date_format)
+
+    def __setitem__(self, index: int, value) -> None:
+        date = self.parse(value)
+        self.values[index] = np.datetime64("NaT") if date is None else date
+
+        if date is None and value is not None:
+            self.raw[int(index)] = value
+        else:
+            self.raw.pop(int(index), None)
+
+    def parse(self, text) -> np.datetime64:
+        """ Parses text into a datetime64[D], or None if it does not round-trip through date_format"""
+        try:
+            date = datetime.strptime(text, self.date_format)
+        except (TypeError, ValueError, OverflowError):
+            return None
+        if date.strftime(self.date_format) != text:
+            return None
+        return np.datetime64(date.date(), "D")
+
+    def to_series(self) -> pd.Series:
+        """
+        Converts to a datetime column when every entry parsed and fits in pandas' datetime range,
+        otherwise to an object column of the date text, with only the affected rows formatted one by one
+        """
+        parsed = ~np.isnat(self.values)
+        exportable = (self.values >= self.__min_exportable) & (self.values <= self.__max_exportable)
+        if len(self.raw) == 0 and np.array_equal(parsed, exportable):
+            return pd.Series(self.values.astype("datetime64[ns]"), copy = False)
+
+        text = np.full(len(self), None, dtype=object)
+        text[exportable] = np.asarray(pd.DatetimeIndex(self.values[exportable].astype("datetime64[ns]")).strftime(self.date_format))
+        for i in np.flatnonzero(parsed & ~exportable):
+            text[i] = self[i]
+        for (i, value) in self.raw.items():
+            text[i] = value
+        return pd.Series(text, dtype = object)
+
+ESERVICES_IND_CATEGORIES = ("Active", "Inactive")
+EMPLOYMENT_STATUS_CATEGORIES = ("T", "A", "P")
+YES_NO_CATEGORIES = ("Y", "N")
+SOURCE_SYSTEM_CATEGORIES = ("Workday", "OIM", "Banner")
+ADMINID_COMPLETED_CATEGORIES = ("Y", "N", "User NIL", "AdminID NIL", "T")
+PWD_TYPE_CATEGORIES = ("CAP", "Dept", "Don't change")
+SSO_CATEGORIES = (True, False)
+SVCACCT_COMPLETED_CATEGORIES = ("Y", "N", "Acct NIL", "T")
+
 class AdminIDLookup():
     """
     Class to encode and check user AdminID details stored from checking MyAccount page
     - :param: length: Length of the input list of users
-    - :param: (Optional) Specify a student end-date, set as 05/31/2022 by default
+    - :param: (Optional) Specify a student end-date (MM/DD/YYYY), set as 05/31/2022 by default
 
     - :field: eservices_ind: "Active" | "Inactive"
     - :field: employment_status: "T" | "A" | "P"
@@ -26,28 +156,36 @@ class AdminIDLookup():
                          "Y" for completed, "N" for not completed due to invalid details (eg. terminated), "User NIL" for user not found 
                          according to search parameter, "AdminID NIL" for when application was not found in the user's list in delete mode,
                          "T" for a program time-out for any reason
+
+    Categorical fields are CategoricalColumns and end_date is a DateColumn. The is_* queries take an index
+    for a single user, or return a boolean array over the whole list when index is left as None.
     """
     def __init__(self, length : int, student_enddate: str = "05/31/2022"):
-        self.eservices_ind = np.empty(length, dtype=object)
-        self.employment_status = np.empty(length, dtype=object)
-        self.student_status = np.empty(length, dtype=object)
-        self.affiliate_status = np.empty(length, dtype=object)
-        self.end_date = np.empty(length, dtype=object)
-        self.source_system = np.empty(length, dtype=object)
-        self.completed = np.empty(length, dtype=object)
+        self.eservices_ind = CategoricalColumn(length, ESERVICES_IND_CATEGORIES)
+        self.employment_status = CategoricalColumn(length, EMPLOYMENT_STATUS_CATEGORIES)
+        self.student_status = CategoricalColumn(length, YES_NO_CATEGORIES)
+        self.affiliate_status = CategoricalColumn(length, YES_NO_CATEGORIES)
+        self.end_date = DateColumn(length)
+        self.source_system = CategoricalColumn(length, SOURCE_SYSTEM_CATEGORIES)
+        self.completed = CategoricalColumn(length, ADMINID_COMPLETED_CATEGORIES)
+
+        if self.end_date.parse(student_enddate) is None:
+            raise ValueError("Student end-date should be a MM/DD/YYYY date, got {!r}".format(student_enddate))
         self.student_enddate = student_enddate
 
-    def is_affiliate(self, index : int) -> bool:
+    def is_affiliate(self, index: Optional[int] = None) -> Union[bool, np.ndarray]:
         """ Whether index-th user in the list is an affiliate"""
-        return self.affiliate_status[index] == "Y"
+        return self.affiliate_status.equals("Y", index)
 
-    def is_student(self, index: int) -> bool:
+    def is_student(self, index: Optional[int] = None) -> Union[bool, np.ndarray]:
         """ Whether index-th user in the list is a student"""
-        return self.source_system[index] == "Banner"
+        return self.source_system.equals("Banner", index)
     
-    def is_valid(self, index: int) -> bool:
+    def is_valid(self, index: Optional[int] = None) -> Union[bool, np.ndarray]:
         """ Whether index-th user in the list is valid (employed/has affiliate status)"""
-        return ((self.employment_status[index] != "T") or self.is_affiliate(index)) and self.eservices_ind[index] == "Active"
+        if index is None:
+            return (~self.employment_status.equals("T") | self.is_affiliate()) & self.eservices_ind.equals("Active")
+        return ((not self.employment_status.equals("T", index)) or self.is_affiliate(index)) and self.eservices_ind.equals("Active", index)
 
     def set_student_enddate(self, index: int):
         """ If student, sets end-date to user defined student end-date"""
@@ -56,8 +194,13 @@ class AdminIDLookup():
     
     def to_df(self) -> pd.DataFrame:
         """ Converts AdminIDLookup object into a DataFrame """
-        zipped = list(zip(self.eservices_ind, self.employment_status, self.student_status, self.affiliate_status, self.end_date, self.source_system, self.completed))
-        return pd.DataFrame(zipped, columns = ['E-Services Indicator', 'Employment Status', 'Student Status', 'Affiliate Status', 'End Date', 'Source System', 'Completed'])
+        return pd.DataFrame({'E-Services Indicator': self.eservices_ind.to_categorical(),
+                             'Employment Status': self.employment_status.to_categorical(),
+                             'Student Status': self.student_status.to_categorical(),
+                             'Affiliate Status': self.affiliate_status.to_categorical(),
+                             'End Date': self.end_date.to_series(),
+                             'Source System': self.source_system.to_categorical(),
+                             'Completed': self.completed.to_categorical()}, copy = False)
 
 class SvcAcctLookup():
     """
@@ -66,7 +209,7 @@ class SvcAcctLookup():
 
     - :field: type: Service Account Type
     - :field: sponsor: current sponsor
-    - :field: end date: current end date
+    - :field: end date: current end date, as shown in the edit page's end_date input
     - :field: pwd_type: "CAP" | "Dept" | "Don't change"
     - :field: sso: Whether SSO is set up for the account
     - :field: completed: "Y" | "N" | "Acct NIL" | "T"  represents if requested action was completed. 
@@ -74,17 +217,21 @@ class SvcAcctLookup():
                          according to search parameter,  "T" for a program time-out for any reason
     """
     def __init__(self, length : int):
-        self.type = np.empty(length, dtype=object)
+        self.type = CategoricalColumn(length)
         self.sponsor = np.empty(length, dtype=object)
-        self.end_date = np.empty(length, dtype=object)
-        self.pwd_type = np.empty(length, dtype=object)
-        self.sso = np.empty(length, dtype=object)
-        self.completed = np.empty(length, dtype=object)
+        self.end_date = DateColumn(length)
+        self.pwd_type = CategoricalColumn(length, PWD_TYPE_CATEGORIES)
+        self.sso = CategoricalColumn(length, SSO_CATEGORIES)
+        self.completed = CategoricalColumn(length, SVCACCT_COMPLETED_CATEGORIES)
 
     def to_df(self) -> pd.DataFrame:
         """ Converts SvcAcctLookup object into a DataFrame """
-        zipped = list(zip(self.type, self.sponsor, self.end_date, self.pwd_type, self.sso, self.completed))
-        return pd.DataFrame(zipped, columns = ['Acct Type', 'Sponsor Name', 'End Date', 'Password Type', 'SSO Activated', 'Completed'])
+        return pd.DataFrame({'Acct Type': self.type.to_categorical(),
+                             'Sponsor Name': self.sponsor,
+                             'End Date': self.end_date.to_series(),
+                             'Password Type': self.pwd_type.to_categorical(),
+                             'SSO Activated': self.sso.to_categorical(),
+                             'Completed': self.completed.to_categorical()}, copy = False)
 
 class AdminIDDetails(object):
     """
@@ -242,7 +389,7 @@ class MyAccountDriver(object):
 
             #Export file
             df = pd.concat([df, record.to_df()], axis = 1)
-            df.to_csv("output/{}".format(output_name) , index = False)
+            df.to_csv("output/{}".format(output_name) , index = False, date_format = record.end_date.date_format)
 
             #Print concluding statement
             if mode == "M":
@@ -256,7 +403,7 @@ class MyAccountDriver(object):
             elif mode == "S":
                 print("Change Sponsor: Completed")
     
-    def __read_svcacct(self, i: int, record: AdminIDLookup):
+    def __read_svcacct(self, i: int, record: SvcAcctLookup):
         __info_xpath_dictionary = { 'type': '//select[@id="ser_acc_type"]/option[@selected="selected"]',
                             'sponsor': '//input[@id="sponsorname"]',
                             'end_date': '//input[@name="end_date"]',
@@ -458,7 +605,7 @@ class MyAccountDriver(object):
 
             #Export file
             df = pd.concat([df, record.to_df()], axis = 1)
-            df.to_csv("output/{}".format(output_name) , index = False)
+            df.to_csv("output/{}".format(output_name) , index = False, date_format = record.end_date.date_format)
 
             #Print concluding statement
             if mode == "C":